@@ -32,6 +32,18 @@ class Settings(BaseSettings):
         default=86400,  # 24 hours
         description="Session TTL in seconds"
     )
+    redis_max_connections: int = Field(
+        default=64,
+        description="Max connections in the shared Redis pool"
+    )
+    redis_pool_timeout: int = Field(
+        default=20,
+        description="Seconds to wait for a free pooled Redis connection"
+    )
+    redis_health_check_interval: int = Field(
+        default=30,
+        description="Seconds a pooled Redis connection may idle before it is pinged"
+    )
 
     # Rate Limiting
     login_rate_limit: int = Field(
@@ -49,6 +61,10 @@ class Settings(BaseSettings):
         default="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
         description="Log message format"
     )
+    log_json: bool = Field(
+        default=False,
+        description="Emit logs as JSON lines instead of log_format text"
+    )
 
     # Debug mode
     debug: bool = Field(default=False, description="Enable debug mode")
@@ -3,6 +3,7 @@ Authentication Handlers
 /start, /login, /logout commands
 """
 import logging
+import time
 from typing import Optional
 
 from aiogram import Router, F
@@ -12,7 +13,7 @@ from aiogram.filters import Command, CommandStart, CommandObject
 from api import get_tabys_client, TabysAPIError
 from services import get_session_service
 from models import UserSession
-from middlewares import LoginRateLimitMiddleware, RBACContext
+from middlewares import LoginRateLimitMiddleware, RBACContext, get_rbac_context
 from keyboards import get_main_menu, get_back_keyboard
 from utils import format_session_info, get_logger, format_datetime
 
@@ -146,7 +147,7 @@ async def cmd_login(
         )
 
         # Create RBAC context for menu
-        new_rbac = RBACContext(session.role)
+        new_rbac = get_rbac_context(session.role)
 
         logger.auth_event(
             "login", user.id, True,
@@ -295,10 +296,9 @@ async def cmd_status(
         role_icon = role_emoji.get(session.role, "👤")
 
         # Calculate session age
-        from datetime import datetime
-        age = datetime.utcnow() - session.created_at
-        hours = int(age.total_seconds() // 3600)
-        minutes = int((age.total_seconds() % 3600) // 60)
+        age = time.time() - session.created_at
+        hours = int(age // 3600)
+        minutes = int((age % 3600) // 60)
 
         await message.answer(
             f"📊 <b>Статус сессии</b>\n\n"
@@ -2,6 +2,7 @@
 Keyboard Builders
 Inline and reply keyboards for bot interactions
 """
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
 from aiogram.types import (
     InlineKeyboardMarkup,
@@ -16,56 +17,45 @@ from models import Module, Permission
 from middlewares.rbac import RBACContext
 
 
+# Main menu content buttons in display order, paired with their module bit
+_CONTENT_BUTTONS = tuple(
+    (module.bit, InlineKeyboardButton(text=text, callback_data=f"menu:{module.value}"))
+    for module, text in (
+        (Module.EVENTS, "📅 Мероприятия"),
+        (Module.COURSES, "🎓 Курсы"),
+        (Module.VACANCIES, "💼 Вакансии"),
+        (Module.NEWS, "📰 Новости"),
+        (Module.PROJECTS, "🚀 Проекты"),
+        (Module.VOLUNTEERS, "🤝 Волонтеры"),
+    )
+)
+
+
 def get_main_menu(rbac: RBACContext) -> InlineKeyboardMarkup:
     """
     Build main menu keyboard based on user permissions
 
+    The menu only depends on the read mask and admin flag, so markups
+    are built once per combination and shared (do not mutate them).
+
     Args:
         rbac: RBAC context with user permissions
 
     Returns:
         InlineKeyboardMarkup with accessible modules
     """
-    builder = InlineKeyboardBuilder()
+    return _build_main_menu(rbac.read_mask, rbac.is_admin())
 
-    # Content modules (2 per row for better layout)
-    content_buttons = []
 
-    if rbac.can_read(Module.EVENTS):
-        content_buttons.append(InlineKeyboardButton(
-            text="📅 Мероприятия",
-            callback_data="menu:events"
-        ))
-
-    if rbac.can_read(Module.COURSES):
-        content_buttons.append(InlineKeyboardButton(
-            text="🎓 Курсы",
-            callback_data="menu:courses"
-        ))
-
-    if rbac.can_read(Module.VACANCIES):
-        content_buttons.append(InlineKeyboardButton(
-            text="💼 Вакансии",
-            callback_data="menu:vacancies"
-        ))
-
-    if rbac.can_read(Module.NEWS):
-        content_buttons.append(InlineKeyboardButton(
-            text="📰 Новости",
-            callback_data="menu:news"
-        ))
-
-    if rbac.can_read(Module.PROJECTS):
-        content_buttons.append(InlineKeyboardButton(
-            text="🚀 Проекты",
-            callback_data="menu:projects"
-        ))
+@lru_cache(maxsize=32)
+def _build_main_menu(read_mask: int, is_admin: bool) -> InlineKeyboardMarkup:
+    """Build main menu markup for a read mask / admin flag combination"""
+    builder = InlineKeyboardBuilder()
 
-    if rbac.can_read(Module.VOLUNTEERS):
-        content_buttons.append(InlineKeyboardButton(
-            text="🤝 Волонтеры",
-            callback_data="menu:volunteers"
-        ))
+    # Content modules (2 per row for better layout)
+    content_buttons = [
+        button for bit, button in _CONTENT_BUTTONS if read_mask & bit
+    ]
 
     # Add content buttons in rows of 2
     for i in range(0, len(content_buttons), 2):
@@ -75,7 +65,7 @@ def get_main_menu(rbac: RBACContext) -> InlineKeyboardMarkup:
             builder.row(content_buttons[i])
 
     # Admin section (full width)
-    if rbac.is_admin():
+    if is_admin:
         builder.row(InlineKeyboardButton(
             text="⚙️ Админ панель",
             callback_data="menu:admin"
@@ -274,8 +264,9 @@ def get_list_item_keyboard(
     return builder.as_markup()
 
 
+@lru_cache(maxsize=64)
 def get_back_keyboard(callback_data: str = "menu:main") -> InlineKeyboardMarkup:
-    """Simple back button keyboard"""
+    """Simple back button keyboard (cached per callback_data, do not mutate)"""
     builder = InlineKeyboardBuilder()
     builder.row(InlineKeyboardButton(
         text="◀️ Назад",
@@ -284,8 +275,9 @@ def get_back_keyboard(callback_data: str = "menu:main") -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@lru_cache(maxsize=1)
 def get_admin_menu_keyboard() -> InlineKeyboardMarkup:
-    """Admin-specific menu keyboard"""
+    """Admin-specific menu keyboard (built once, do not mutate)"""
     builder = InlineKeyboardBuilder()
 
     # Admin features in 2 columns
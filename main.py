@@ -7,8 +7,10 @@ import logging
 import sys
 from contextlib import asynccontextmanager
 
+import orjson
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
 from aiogram.enums import ParseMode
 
 from config import settings
@@ -59,17 +61,15 @@ def create_dispatcher() -> Dispatcher:
     """Create and configure dispatcher"""
     dp = Dispatcher()
 
-    # Register middlewares (order matters!)
-    # 1. Rate limiting (before anything else)
-    dp.message.middleware(RateLimitMiddleware())
+    # Register middlewares on the root update observer (order matters!)
+    # 1. Rate limiting (before anything else, messages only)
+    dp.update.middleware(RateLimitMiddleware())
 
     # 2. Authentication (check session)
-    dp.message.middleware(AuthMiddleware())
-    dp.callback_query.middleware(AuthMiddleware())
+    dp.update.middleware(AuthMiddleware())
 
     # 3. RBAC (depends on auth)
-    dp.message.middleware(RBACMiddleware())
-    dp.callback_query.middleware(RBACMiddleware())
+    dp.update.middleware(RBACMiddleware())
 
     # Register routers
     # IMPORTANT: user_link_router MUST be first to handle deep links before auth
@@ -90,10 +90,20 @@ def create_dispatcher() -> Dispatcher:
     return dp
 
 
+def _orjson_dumps(obj) -> str:
+    """orjson encoder returning str, as aiogram expects"""
+    return orjson.dumps(obj).decode()
+
+
 def create_bot() -> Bot:
     """Create bot instance"""
     return Bot(
         token=settings.telegram_bot_token,
+        # orjson for request payloads (keyboards) and API responses
+        session=AiohttpSession(
+            json_loads=orjson.loads,
+            json_dumps=_orjson_dumps,
+        ),
         default=DefaultBotProperties(
             parse_mode=ParseMode.HTML
         )
@@ -129,6 +139,11 @@ async def main():
 
 
 if __name__ == "__main__":
+    if sys.platform != "win32":
+        # libuv-based event loop for faster I/O scheduling
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
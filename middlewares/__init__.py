@@ -8,6 +8,7 @@ from .auth import (
 from .rbac import (
     RBACMiddleware,
     RBACContext,
+    get_rbac_context,
     require_permission,
     require_role,
     has_permission,
@@ -15,6 +16,12 @@ from .rbac import (
     is_read_only,
     ROLE_PERMISSIONS,
     ROLE_HIERARCHY,
+    ROLE_MASKS,
+    LEVEL_CLIENT,
+    LEVEL_MODULE_ADMIN,
+    LEVEL_GOVERNMENT,
+    LEVEL_ADMIN,
+    LEVEL_SUPER_ADMIN,
 )
 from .rate_limit import (
     RateLimitMiddleware,
@@ -30,6 +37,7 @@ __all__ = [
     # RBAC
     "RBACMiddleware",
     "RBACContext",
+    "get_rbac_context",
     "require_permission",
     "require_role",
     "has_permission",
@@ -37,6 +45,12 @@ __all__ = [
     "is_read_only",
     "ROLE_PERMISSIONS",
     "ROLE_HIERARCHY",
+    "ROLE_MASKS",
+    "LEVEL_CLIENT",
+    "LEVEL_MODULE_ADMIN",
+    "LEVEL_GOVERNMENT",
+    "LEVEL_ADMIN",
+    "LEVEL_SUPER_ADMIN",
     # Rate Limiting
     "RateLimitMiddleware",
     "LoginRateLimitMiddleware",
@@ -8,12 +8,25 @@ from typing import Callable, Dict, Any, Awaitable, Optional
 from aiogram import BaseMiddleware
 from aiogram.types import Message, CallbackQuery, Update, TelegramObject
 
-from services import get_session_service
+from services import SessionService, get_session_service
 from models import UserSession
 
 logger = logging.getLogger(__name__)
 
 
+def get_user_id(event: TelegramObject) -> Optional[int]:
+    """
+    Extract user ID from an event
+
+    Middlewares are attached to dp.update, so an Update is unwrapped to
+    the Message or CallbackQuery it carries, both exposing from_user.
+    """
+    if isinstance(event, Update):
+        event = event.event
+    from_user = getattr(event, "from_user", None)
+    return from_user.id if from_user else None
+
+
 class AuthMiddleware(BaseMiddleware):
     """
     Authentication middleware for aiogram 3.x
@@ -25,6 +38,10 @@ class AuthMiddleware(BaseMiddleware):
     unauthenticated users gracefully.
     """
 
+    def __init__(self):
+        # Resolved on first event, then reused
+        self._session_service: Optional[SessionService] = None
+
     async def __call__(
         self,
         handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
@@ -32,18 +49,28 @@ class AuthMiddleware(BaseMiddleware):
         data: Dict[str, Any],
     ) -> Any:
         # Extract user ID from event
-        user_id = self._get_user_id(event)
+        user_id = get_user_id(event)
 
         if user_id:
-            session_service = await get_session_service()
-            session = await session_service.get_session(str(user_id))
+            session_service = self._session_service
+            if session_service is None:
+                session_service = self._session_service = await get_session_service()
+
+            if "session" in data:
+                # Already fetched by RateLimitMiddleware's batched check
+                session = data["session"]
+            else:
+                session = await session_service.get_session(str(user_id))
+
+            # Refresh session activity; a session gone from Redis was
+            # logged out elsewhere or expired, so treat the user as a guest
+            if session and not await session_service.update_session(session):
+                session = None
 
             if session:
-                # Refresh session activity
-                await session_service.update_session(session)
                 data["session"] = session
                 data["is_authenticated"] = True
-                logger.debug(f"User {user_id} authenticated as admin_id={session.admin_id}")
+                logger.debug("User %s authenticated as admin_id=%s", user_id, session.admin_id)
             else:
                 data["session"] = None
                 data["is_authenticated"] = False
@@ -53,19 +80,6 @@ class AuthMiddleware(BaseMiddleware):
 
         return await handler(event, data)
 
-    def _get_user_id(self, event: TelegramObject) -> Optional[int]:
-        """Extract user ID from various event types"""
-        if isinstance(event, Message):
-            return event.from_user.id if event.from_user else None
-        elif isinstance(event, CallbackQuery):
-            return event.from_user.id if event.from_user else None
-        elif isinstance(event, Update):
-            if event.message and event.message.from_user:
-                return event.message.from_user.id
-            elif event.callback_query and event.callback_query.from_user:
-                return event.callback_query.from_user.id
-        return None
-
 
 def require_auth(handler: Callable) -> Callable:
     """
@@ -110,6 +124,8 @@ class SessionContext:
     Provides convenient access to session data and authentication status
     """
 
+    __slots__ = ("_session", "_is_authenticated")
+
     def __init__(self, data: Dict[str, Any]):
         self._session: Optional[UserSession] = data.get("session")
         self._is_authenticated: bool = data.get("is_authenticated", False)
@@ -2,25 +2,53 @@
 Rate Limiting Middleware
 Prevents abuse of bot commands
 """
+import asyncio
 import logging
-from typing import Callable, Dict, Any, Awaitable, Optional
+from time import monotonic
+from typing import Callable, Dict, Any, Awaitable, Optional, Tuple
 
 from aiogram import BaseMiddleware
-from aiogram.types import Message, TelegramObject
+from cachetools import TTLCache
+from aiogram.types import Message, Update, TelegramObject
 
 from config import settings
-from services import get_session_service
+from models import UserSession
+from services import SessionService, get_session_service
+from .auth import get_user_id
 
 logger = logging.getLogger(__name__)
 
 
+def _get_message(event: TelegramObject) -> Optional[Message]:
+    """Message carried by the event (callback queries are not rate limited)"""
+    if isinstance(event, Update):
+        return event.message
+    return event if isinstance(event, Message) else None
+
+
 class RateLimitMiddleware(BaseMiddleware):
     """
     Rate limiting middleware for bot commands
 
-    Limits request frequency per user to prevent abuse
+    Limits request frequency per user to prevent abuse.
+
+    Requests are reserved from the shared Redis window in small leases
+    and spent locally until the lease runs out or its window ends. The
+    Redis counter already includes every leased request, so all
+    instances together never allow more than max_requests per window,
+    while most events skip the round-trip.
+
+    Refills are single-flight per user: concurrent events (e.g. a media
+    album) that find the lease empty share one Redis round-trip and then
+    spend from the refilled lease.
     """
 
+    # Upper bound on users tracked in the local leases
+    LOCAL_LEASES_MAXSIZE = 10_000
+
+    # Share of max_requests reserved per Redis round-trip
+    LEASE_DIVISOR = 4
+
     def __init__(
         self,
         max_requests: int = None,
@@ -30,6 +58,78 @@ class RateLimitMiddleware(BaseMiddleware):
         self.max_requests = max_requests or settings.general_rate_limit
         self.window_seconds = window_seconds
         self.action = action
+        self._deny_msg = f"Too many requests. Please wait {window_seconds} seconds."
+
+        # user_id -> (leased requests left, monotonic end of their window);
+        # a lease never outlives the window it was reserved from
+        self._local_leases: TTLCache[int, Tuple[int, float]] = TTLCache(
+            maxsize=self.LOCAL_LEASES_MAXSIZE,
+            ttl=window_seconds,
+        )
+        self._lease_size = max(1, self.max_requests // self.LEASE_DIVISOR)
+
+        # user_id -> in-flight refill, resolving to (granted, session)
+        self._refills: Dict[int, asyncio.Task] = {}
+
+        # Resolved on first event, then reused
+        self._session_service: Optional[SessionService] = None
+
+    async def _get_session_service(self) -> SessionService:
+        """Get the session service, resolving it only once"""
+        if self._session_service is None:
+            self._session_service = await get_session_service()
+        return self._session_service
+
+    def _take_local_token(self, user_id: int) -> Tuple[bool, int]:
+        """
+        Spend one request from the user's local lease
+
+        Returns:
+            Tuple of (token_taken, remaining_tokens)
+        """
+        lease = self._local_leases.get(user_id)
+        if lease is None:
+            return False, 0
+
+        tokens, expires_at = lease
+        if tokens < 1 or monotonic() >= expires_at:
+            return False, 0
+
+        tokens -= 1
+        self._local_leases[user_id] = (tokens, expires_at)
+        return True, tokens
+
+    def _add_lease(self, user_id: int, granted: int, window_left: int):
+        """Add granted requests to the user's live lease, if any"""
+        expires_at = monotonic() + window_left
+        lease = self._local_leases.get(user_id)
+        if lease is not None and lease[1] > monotonic():
+            tokens, old_expires_at = lease
+            # Never let tokens outlive the window they were reserved from
+            self._local_leases[user_id] = (
+                tokens + granted, min(old_expires_at, expires_at)
+            )
+        else:
+            self._local_leases[user_id] = (granted, expires_at)
+
+    async def _refill(self, user_id: int) -> Tuple[int, Optional[UserSession]]:
+        """Reserve a new lease from Redis for the user"""
+        try:
+            session_service = await self._get_session_service()
+            # Session rides along with the rate-limit round-trip;
+            # AuthMiddleware picks it up from data instead of refetching
+            granted, window_left, session = await session_service.batched_check(
+                str(user_id),
+                self.action,
+                self.max_requests,
+                self.window_seconds,
+                reserve=self._lease_size,
+            )
+            if granted:
+                self._add_lease(user_id, granted, window_left)
+            return granted, session
+        finally:
+            self._refills.pop(user_id, None)
 
     async def __call__(
         self,
@@ -37,33 +137,33 @@ class RateLimitMiddleware(BaseMiddleware):
         event: TelegramObject,
         data: Dict[str, Any],
     ) -> Any:
-        user_id = self._get_user_id(event)
+        message = _get_message(event)
+        user_id = get_user_id(message) if message else None
 
         if user_id:
-            session_service = await get_session_service()
-            is_allowed, remaining = await session_service.check_rate_limit(
-                str(user_id),
-                self.action,
-                self.max_requests,
-                self.window_seconds,
-            )
-
-            data["rate_limit_remaining"] = remaining
-
-            if not is_allowed:
-                if isinstance(event, Message):
-                    await event.answer(
-                        f"Too many requests. Please wait {self.window_seconds} seconds."
+            while True:
+                taken, remaining = self._take_local_token(user_id)
+                if taken:
+                    data["rate_limit_remaining"] = remaining
+                    return await handler(event, data)
+
+                refill = self._refills.get(user_id)
+                if refill is None:
+                    refill = self._refills[user_id] = asyncio.create_task(
+                        self._refill(user_id)
                     )
-                return
+                # Shielded so one cancelled event doesn't cancel the others' refill
+                granted, session = await asyncio.shield(refill)
+                data["session"] = session
 
-        return await handler(event, data)
+                if not granted:
+                    data["rate_limit_remaining"] = 0
+                    await message.answer(self._deny_msg)
+                    return
+                # Other events sharing the refill may have spent the whole
+                # lease; if so, loop and refill again until Redis denies
 
-    def _get_user_id(self, event: TelegramObject) -> Optional[int]:
-        """Extract user ID from event"""
-        if isinstance(event, Message):
-            return event.from_user.id if event.from_user else None
-        return None
+        return await handler(event, data)
 
 
 class LoginRateLimitMiddleware(RateLimitMiddleware):
@@ -75,6 +175,10 @@ class LoginRateLimitMiddleware(RateLimitMiddleware):
             window_seconds=60,
             action="login"
         )
+        self._deny_msg = (
+            "Too many login attempts.\n"
+            f"Please wait {self.window_seconds} seconds before trying again."
+        )
 
     async def __call__(
         self,
@@ -82,10 +186,11 @@ class LoginRateLimitMiddleware(RateLimitMiddleware):
         event: TelegramObject,
         data: Dict[str, Any],
     ) -> Any:
-        user_id = self._get_user_id(event)
+        message = _get_message(event)
+        user_id = get_user_id(message) if message else None
 
         if user_id:
-            session_service = await get_session_service()
+            session_service = await self._get_session_service()
             is_allowed, remaining = await session_service.check_rate_limit(
                 str(user_id),
                 self.action,
@@ -94,12 +199,8 @@ class LoginRateLimitMiddleware(RateLimitMiddleware):
             )
 
             if not is_allowed:
-                logger.warning(f"Login rate limit exceeded for user {user_id}")
-                if isinstance(event, Message):
-                    await event.answer(
-                        "Too many login attempts.\n"
-                        f"Please wait {self.window_seconds} seconds before trying again."
-                    )
+                logger.warning("Login rate limit exceeded for user %s", user_id)
+                await message.answer(self._deny_msg)
                 return
 
         return await handler(event, data)
@@ -3,88 +3,174 @@ Role-Based Access Control Middleware
 Mirrors Tabys backend RBAC permissions
 """
 import logging
-from typing import Callable, Dict, Any, Awaitable, Set, Optional, List
+from typing import Callable, Collection, Dict, Any, Awaitable, FrozenSet, Set, Optional, Tuple
 
 from aiogram import BaseMiddleware
 from aiogram.types import Message, CallbackQuery, TelegramObject
 
-from models import Role, Module, Permission, UserSession
+from models import MODULE_BITS, UserSession
+from models.constants import (
+    MODULE_CERTIFICATES,
+    MODULE_COURSES,
+    MODULE_EVENTS,
+    MODULE_EXPERTS,
+    MODULE_LEISURE,
+    MODULE_NEWS,
+    MODULE_PROJECTS,
+    MODULE_RESUMES,
+    MODULE_USERS,
+    MODULE_VACANCIES,
+    MODULE_VOLUNTEERS,
+    PERMISSION_CREATE,
+    PERMISSION_DELETE,
+    PERMISSION_READ,
+    PERMISSION_UPDATE,
+    ROLE_ADMINISTRATOR,
+    ROLE_CLIENT,
+    ROLE_GOVERNMENT,
+    ROLE_MSB,
+    ROLE_NPO,
+    ROLE_SUPER_ADMIN,
+    ROLE_VOLUNTEER_ADMIN,
+)
 
 logger = logging.getLogger(__name__)
 
 
 # Role permissions mapping (mirrors Tabys backend app/rbac/permissions.py)
 ROLE_PERMISSIONS: Dict[str, Dict[str, Set[str]]] = {
-    Role.CLIENT: {},
+    ROLE_CLIENT: {},
 
-    Role.VOLUNTEER_ADMIN: {
-        Module.VOLUNTEERS: {Permission.READ, Permission.CREATE, Permission.UPDATE, Permission.DELETE},
+    ROLE_VOLUNTEER_ADMIN: {
+        MODULE_VOLUNTEERS: {PERMISSION_READ, PERMISSION_CREATE, PERMISSION_UPDATE, PERMISSION_DELETE},
     },
 
-    Role.MSB: {
-        Module.VACANCIES: {Permission.READ, Permission.CREATE, Permission.UPDATE, Permission.DELETE},
-        Module.LEISURE: {Permission.READ, Permission.CREATE, Permission.UPDATE, Permission.DELETE},
+    ROLE_MSB: {
+        MODULE_VACANCIES: {PERMISSION_READ, PERMISSION_CREATE, PERMISSION_UPDATE, PERMISSION_DELETE},
+        MODULE_LEISURE: {PERMISSION_READ, PERMISSION_CREATE, PERMISSION_UPDATE, PERMISSION_DELETE},
     },
 
-    Role.NPO: {
-        Module.PROJECTS: {Permission.READ, Permission.CREATE, Permission.UPDATE, Permission.DELETE},
-        Module.EVENTS: {Permission.READ, Permission.CREATE, Permission.UPDATE, Permission.DELETE},
+    ROLE_NPO: {
+        MODULE_PROJECTS: {PERMISSION_READ, PERMISSION_CREATE, PERMISSION_UPDATE, PERMISSION_DELETE},
+        MODULE_EVENTS: {PERMISSION_READ, PERMISSION_CREATE, PERMISSION_UPDATE, PERMISSION_DELETE},
     },
 
-    Role.GOVERNMENT: {
+    ROLE_GOVERNMENT: {
         # Read-only access to everything
-        Module.VOLUNTEERS: {Permission.READ},
-        Module.VACANCIES: {Permission.READ},
-        Module.LEISURE: {Permission.READ},
-        Module.PROJECTS: {Permission.READ},
-        Module.EVENTS: {Permission.READ},
-        Module.NEWS: {Permission.READ},
-        Module.USERS: {Permission.READ},
-        Module.COURSES: {Permission.READ},
-        Module.CERTIFICATES: {Permission.READ},
-        Module.EXPERTS: {Permission.READ},
-        Module.RESUMES: {Permission.READ},
+        MODULE_VOLUNTEERS: {PERMISSION_READ},
+        MODULE_VACANCIES: {PERMISSION_READ},
+        MODULE_LEISURE: {PERMISSION_READ},
+        MODULE_PROJECTS: {PERMISSION_READ},
+        MODULE_EVENTS: {PERMISSION_READ},
+        MODULE_NEWS: {PERMISSION_READ},
+        MODULE_USERS: {PERMISSION_READ},
+        MODULE_COURSES: {PERMISSION_READ},
+        MODULE_CERTIFICATES: {PERMISSION_READ},
+        MODULE_EXPERTS: {PERMISSION_READ},
+        MODULE_RESUMES: {PERMISSION_READ},
     },
 
-    Role.ADMINISTRATOR: {
-        Module.NEWS: {Permission.READ, Permission.CREATE, Permission.UPDATE, Permission.DELETE},
-        Module.USERS: {Permission.READ, Permission.CREATE, Permission.UPDATE, Permission.DELETE},
-        Module.VOLUNTEERS: {Permission.READ, Permission.CREATE, Permission.UPDATE, Permission.DELETE},
-        Module.VACANCIES: {Permission.READ, Permission.CREATE, Permission.UPDATE, Permission.DELETE},
-        Module.LEISURE: {Permission.READ, Permission.CREATE, Permission.UPDATE, Permission.DELETE},
-        Module.PROJECTS: {Permission.READ, Permission.CREATE, Permission.UPDATE, Permission.DELETE},
-        Module.EVENTS: {Permission.READ, Permission.CREATE, Permission.UPDATE, Permission.DELETE},
-        Module.COURSES: {Permission.READ, Permission.CREATE, Permission.UPDATE, Permission.DELETE},
-        Module.CERTIFICATES: {Permission.READ, Permission.CREATE, Permission.UPDATE, Permission.DELETE},
-        Module.EXPERTS: {Permission.READ, Permission.CREATE, Permission.UPDATE, Permission.DELETE},
-        Module.RESUMES: {Permission.READ, Permission.CREATE, Permission.UPDATE, Permission.DELETE},
+    ROLE_ADMINISTRATOR: {
+        MODULE_NEWS: {PERMISSION_READ, PERMISSION_CREATE, PERMISSION_UPDATE, PERMISSION_DELETE},
+        MODULE_USERS: {PERMISSION_READ, PERMISSION_CREATE, PERMISSION_UPDATE, PERMISSION_DELETE},
+        MODULE_VOLUNTEERS: {PERMISSION_READ, PERMISSION_CREATE, PERMISSION_UPDATE, PERMISSION_DELETE},
+        MODULE_VACANCIES: {PERMISSION_READ, PERMISSION_CREATE, PERMISSION_UPDATE, PERMISSION_DELETE},
+        MODULE_LEISURE: {PERMISSION_READ, PERMISSION_CREATE, PERMISSION_UPDATE, PERMISSION_DELETE},
+        MODULE_PROJECTS: {PERMISSION_READ, PERMISSION_CREATE, PERMISSION_UPDATE, PERMISSION_DELETE},
+        MODULE_EVENTS: {PERMISSION_READ, PERMISSION_CREATE, PERMISSION_UPDATE, PERMISSION_DELETE},
+        MODULE_COURSES: {PERMISSION_READ, PERMISSION_CREATE, PERMISSION_UPDATE, PERMISSION_DELETE},
+        MODULE_CERTIFICATES: {PERMISSION_READ, PERMISSION_CREATE, PERMISSION_UPDATE, PERMISSION_DELETE},
+        MODULE_EXPERTS: {PERMISSION_READ, PERMISSION_CREATE, PERMISSION_UPDATE, PERMISSION_DELETE},
+        MODULE_RESUMES: {PERMISSION_READ, PERMISSION_CREATE, PERMISSION_UPDATE, PERMISSION_DELETE},
     },
 
-    Role.SUPER_ADMIN: {
+    ROLE_SUPER_ADMIN: {
         # Full access to everything
-        Module.VOLUNTEERS: {Permission.READ, Permission.CREATE, Permission.UPDATE, Permission.DELETE},
-        Module.VACANCIES: {Permission.READ, Permission.CREATE, Permission.UPDATE, Permission.DELETE},
-        Module.LEISURE: {Permission.READ, Permission.CREATE, Permission.UPDATE, Permission.DELETE},
-        Module.PROJECTS: {Permission.READ, Permission.CREATE, Permission.UPDATE, Permission.DELETE},
-        Module.EVENTS: {Permission.READ, Permission.CREATE, Permission.UPDATE, Permission.DELETE},
-        Module.NEWS: {Permission.READ, Permission.CREATE, Permission.UPDATE, Permission.DELETE},
-        Module.USERS: {Permission.READ, Permission.CREATE, Permission.UPDATE, Permission.DELETE},
-        Module.COURSES: {Permission.READ, Permission.CREATE, Permission.UPDATE, Permission.DELETE},
-        Module.CERTIFICATES: {Permission.READ, Permission.CREATE, Permission.UPDATE, Permission.DELETE},
-        Module.EXPERTS: {Permission.READ, Permission.CREATE, Permission.UPDATE, Permission.DELETE},
-        Module.RESUMES: {Permission.READ, Permission.CREATE, Permission.UPDATE, Permission.DELETE},
+        MODULE_VOLUNTEERS: {PERMISSION_READ, PERMISSION_CREATE, PERMISSION_UPDATE, PERMISSION_DELETE},
+        MODULE_VACANCIES: {PERMISSION_READ, PERMISSION_CREATE, PERMISSION_UPDATE, PERMISSION_DELETE},
+        MODULE_LEISURE: {PERMISSION_READ, PERMISSION_CREATE, PERMISSION_UPDATE, PERMISSION_DELETE},
+        MODULE_PROJECTS: {PERMISSION_READ, PERMISSION_CREATE, PERMISSION_UPDATE, PERMISSION_DELETE},
+        MODULE_EVENTS: {PERMISSION_READ, PERMISSION_CREATE, PERMISSION_UPDATE, PERMISSION_DELETE},
+        MODULE_NEWS: {PERMISSION_READ, PERMISSION_CREATE, PERMISSION_UPDATE, PERMISSION_DELETE},
+        MODULE_USERS: {PERMISSION_READ, PERMISSION_CREATE, PERMISSION_UPDATE, PERMISSION_DELETE},
+        MODULE_COURSES: {PERMISSION_READ, PERMISSION_CREATE, PERMISSION_UPDATE, PERMISSION_DELETE},
+        MODULE_CERTIFICATES: {PERMISSION_READ, PERMISSION_CREATE, PERMISSION_UPDATE, PERMISSION_DELETE},
+        MODULE_EXPERTS: {PERMISSION_READ, PERMISSION_CREATE, PERMISSION_UPDATE, PERMISSION_DELETE},
+        MODULE_RESUMES: {PERMISSION_READ, PERMISSION_CREATE, PERMISSION_UPDATE, PERMISSION_DELETE},
     },
 }
 
+# Role groups for admin gates
+_ADMIN_ROLES: FrozenSet[str] = frozenset({ROLE_ADMINISTRATOR, ROLE_SUPER_ADMIN})
+_SUPER_ADMIN_ROLES: FrozenSet[str] = frozenset({ROLE_SUPER_ADMIN})
+
+# Privilege levels, for gates against a fixed role:
+#   ROLE_HIERARCHY.get(user_role, LEVEL_CLIENT) >= LEVEL_ADMIN
+LEVEL_CLIENT = 0
+LEVEL_MODULE_ADMIN = 1
+LEVEL_GOVERNMENT = 2
+LEVEL_ADMIN = 3
+LEVEL_SUPER_ADMIN = 4
+
 # Role hierarchy (higher number = more privileges)
 ROLE_HIERARCHY: Dict[str, int] = {
-    Role.CLIENT: 0,
-    Role.VOLUNTEER_ADMIN: 1,
-    Role.MSB: 1,
-    Role.NPO: 1,
-    Role.GOVERNMENT: 2,
-    Role.ADMINISTRATOR: 3,
-    Role.SUPER_ADMIN: 4,
+    ROLE_CLIENT: LEVEL_CLIENT,
+    ROLE_VOLUNTEER_ADMIN: LEVEL_MODULE_ADMIN,
+    ROLE_MSB: LEVEL_MODULE_ADMIN,
+    ROLE_NPO: LEVEL_MODULE_ADMIN,
+    ROLE_GOVERNMENT: LEVEL_GOVERNMENT,
+    ROLE_ADMINISTRATOR: LEVEL_ADMIN,
+    ROLE_SUPER_ADMIN: LEVEL_SUPER_ADMIN,
+}
+
+
+def _build_mask(module_permissions: Dict[str, Set[str]], permission: str) -> int:
+    """OR together the bits of every module granting permission"""
+    mask = 0
+    for module, permissions in module_permissions.items():
+        if permission in permissions:
+            mask |= MODULE_BITS[module]
+    return mask
+
+
+# Precomputed (read, create, update, delete) module bitmasks per role
+ROLE_MASKS: Dict[str, Tuple[int, int, int, int]] = {
+    role: (
+        _build_mask(module_permissions, PERMISSION_READ),
+        _build_mask(module_permissions, PERMISSION_CREATE),
+        _build_mask(module_permissions, PERMISSION_UPDATE),
+        _build_mask(module_permissions, PERMISSION_DELETE),
+    )
+    for role, module_permissions in ROLE_PERMISSIONS.items()
+}
+_NO_MASKS: Tuple[int, int, int, int] = (0, 0, 0, 0)
+
+# Flattened (role, module, permission) grants for single-probe lookups
+_PERMS: FrozenSet[Tuple[str, str, str]] = frozenset(
+    (role, module, permission)
+    for role, module_permissions in ROLE_PERMISSIONS.items()
+    for module, permissions in module_permissions.items()
+    for permission in permissions
+)
+
+# Permissions that lift a module out of read-only access
+_WRITE_PERMISSIONS: FrozenSet[str] = frozenset(
+    {PERMISSION_CREATE, PERMISSION_UPDATE, PERMISSION_DELETE}
+)
+
+# (role, module) pairs granting READ and nothing else
+_READ_ONLY: FrozenSet[Tuple[str, str]] = frozenset(
+    (role, module)
+    for role, module_permissions in ROLE_PERMISSIONS.items()
+    for module, permissions in module_permissions.items()
+    if PERMISSION_READ in permissions
+    and permissions.isdisjoint(_WRITE_PERMISSIONS)
+)
+
+# Role -> accessible modules, in ROLE_PERMISSIONS order
+_ACCESSIBLE: Dict[str, Tuple[str, ...]] = {
+    role: tuple(module_permissions)
+    for role, module_permissions in ROLE_PERMISSIONS.items()
 }
 
 
@@ -100,48 +186,37 @@ def has_permission(role: str, module: str, permission: str) -> bool:
     Returns:
         bool: True if role has permission
     """
-    if role not in ROLE_PERMISSIONS:
+    if not role or role == ROLE_CLIENT:
         return False
+    return (role, module, permission) in _PERMS
 
-    module_permissions = ROLE_PERMISSIONS.get(role, {}).get(module, set())
-    return permission in module_permissions
 
-
-def get_accessible_modules(role: str) -> List[str]:
+def get_accessible_modules(role: str) -> Tuple[str, ...]:
     """
-    Get list of modules a role can access
+    Get modules a role can access
 
     Args:
         role: User's role
 
     Returns:
-        List of module names
+        Tuple of module names
     """
-    if role not in ROLE_PERMISSIONS:
-        return []
-
-    return list(ROLE_PERMISSIONS[role].keys())
+    if not role or role == ROLE_CLIENT:
+        return ()
+    return _ACCESSIBLE.get(role, ())
 
 
 def is_read_only(role: str, module: str) -> bool:
     """Check if role has only read access to a module"""
-    if role not in ROLE_PERMISSIONS:
+    if not role or role == ROLE_CLIENT:
         return False
-
-    module_permissions = ROLE_PERMISSIONS.get(role, {}).get(module, set())
-
-    return (
-        Permission.READ in module_permissions and
-        not any(p in module_permissions for p in [
-            Permission.CREATE, Permission.UPDATE, Permission.DELETE
-        ])
-    )
+    return (role, module) in _READ_ONLY
 
 
 def has_higher_or_equal_privilege(user_role: str, required_role: str) -> bool:
     """Check if user role has higher or equal privilege than required role"""
-    user_level = ROLE_HIERARCHY.get(user_role, 0)
-    required_level = ROLE_HIERARCHY.get(required_role, 0)
+    user_level = ROLE_HIERARCHY.get(user_role, LEVEL_CLIENT)
+    required_level = ROLE_HIERARCHY.get(required_role, LEVEL_CLIENT)
     return user_level >= required_level
 
 
@@ -162,12 +237,7 @@ class RBACMiddleware(BaseMiddleware):
         data: Dict[str, Any],
     ) -> Any:
         session: Optional[UserSession] = data.get("session")
-
-        if session:
-            data["rbac"] = RBACContext(session.role)
-        else:
-            data["rbac"] = RBACContext(None)
-
+        data["rbac"] = get_rbac_context(session.role if session else None)
         return await handler(event, data)
 
 
@@ -175,80 +245,100 @@ class RBACContext:
     """
     Context for RBAC permission checking in handlers
 
-    Provides convenient methods to check permissions
+    Provides convenient methods to check permissions.
+    Per-permission module bitmasks are resolved once at construction,
+    so checks are a single bitwise AND against ``MODULE_BITS``.
+    Instances are shared per role (see get_rbac_context); treat
+    attributes as read-only.
     """
 
-    def __init__(self, role: Optional[str]):
-        self._role = role
-
-    @property
-    def role(self) -> Optional[str]:
-        return self._role
+    __slots__ = ("role", "read_mask", "create_mask", "update_mask", "delete_mask")
 
-    def can(self, module: str, permission: str = Permission.READ) -> bool:
+    def __init__(self, role: Optional[str]):
+        self.role = role
+        (
+            self.read_mask,
+            self.create_mask,
+            self.update_mask,
+            self.delete_mask,
+        ) = ROLE_MASKS.get(role, _NO_MASKS) if role else _NO_MASKS
+
+    def can(self, module: str, permission: str = PERMISSION_READ) -> bool:
         """Check if user can perform action on module"""
-        if not self._role:
+        if not self.role:
             return False
-        return has_permission(self._role, module, permission)
+        return has_permission(self.role, module, permission)
 
     def can_read(self, module: str) -> bool:
         """Check if user can read module"""
-        return self.can(module, Permission.READ)
+        return bool(self.read_mask & MODULE_BITS.get(module, 0))
 
     def can_create(self, module: str) -> bool:
         """Check if user can create in module"""
-        return self.can(module, Permission.CREATE)
+        return bool(self.create_mask & MODULE_BITS.get(module, 0))
 
     def can_update(self, module: str) -> bool:
         """Check if user can update in module"""
-        return self.can(module, Permission.UPDATE)
+        return bool(self.update_mask & MODULE_BITS.get(module, 0))
 
     def can_delete(self, module: str) -> bool:
         """Check if user can delete in module"""
-        return self.can(module, Permission.DELETE)
+        return bool(self.delete_mask & MODULE_BITS.get(module, 0))
 
     def is_read_only(self, module: str) -> bool:
         """Check if user has only read access"""
-        if not self._role:
-            return False
-        return is_read_only(self._role, module)
+        return (self.role, module) in _READ_ONLY
 
-    def get_accessible_modules(self) -> List[str]:
-        """Get list of accessible modules"""
-        if not self._role:
-            return []
-        return get_accessible_modules(self._role)
+    def get_accessible_modules(self) -> Tuple[str, ...]:
+        """Get accessible modules"""
+        if not self.role:
+            return ()
+        return get_accessible_modules(self.role)
 
     def has_role(self, *roles: str) -> bool:
         """Check if user has one of the specified roles"""
-        if not self._role:
-            return False
-        return self._role in roles
+        return self.has_role_set(roles)
+
+    def has_role_set(self, roles: Collection[str]) -> bool:
+        """Check if user has one of the roles in a prebuilt (frozen)set"""
+        return self.role in roles
 
     def is_admin(self) -> bool:
         """Check if user is administrator or super_admin"""
-        return self.has_role(Role.ADMINISTRATOR, Role.SUPER_ADMIN)
+        return self.role in _ADMIN_ROLES
 
     def is_super_admin(self) -> bool:
         """Check if user is super_admin"""
-        return self.has_role(Role.SUPER_ADMIN)
+        return self.role in _SUPER_ADMIN_ROLES
 
-    def require_permission(self, module: str, permission: str = Permission.READ):
+    def require_permission(self, module: str, permission: str = PERMISSION_READ):
         """Raise exception if user doesn't have permission"""
         if not self.can(module, permission):
             raise PermissionError(
-                f"Access denied: {self._role or 'guest'} cannot {permission} {module}"
+                f"Access denied: {self.role or 'guest'} cannot {permission} {module}"
             )
 
     def require_role(self, *roles: str):
         """Raise exception if user doesn't have one of the roles"""
         if not self.has_role(*roles):
             raise PermissionError(
-                f"Access denied: requires one of {roles}, got {self._role or 'guest'}"
+                f"Access denied: requires one of {roles}, got {self.role or 'guest'}"
             )
 
 
-def require_permission(module: str, permission: str = Permission.READ):
+# Role -> shared RBACContext (contexts are immutable, one per known role)
+_CONTEXT_CACHE: Dict[Optional[str], RBACContext] = {}
+
+
+def get_rbac_context(role: Optional[str]) -> RBACContext:
+    """Get the shared RBACContext for a role"""
+    context = _CONTEXT_CACHE.get(role)
+    if context is None:
+        context = _CONTEXT_CACHE[role] = RBACContext(role)
+    return context
+
+
+def require_permission(module: str, permission: str = PERMISSION_READ):
     """
     Decorator to require specific permission for a handler
 
@@ -258,20 +348,22 @@ def require_permission(module: str, permission: str = Permission.READ):
         async def events_handler(message: Message, session: UserSession):
             ...
     """
+    denied = f"cannot {permission} {module}"
+
     def decorator(handler: Callable) -> Callable:
         async def wrapper(event: TelegramObject, *args, **kwargs):
             rbac: Optional[RBACContext] = kwargs.get("rbac")
 
-            if not rbac or not rbac.can(module, permission):
+            if not rbac or (rbac.role, module, permission) not in _PERMS:
                 role = rbac.role if rbac else "guest"
                 if isinstance(event, Message):
                     await event.answer(
                         f"Access denied.\n"
-                        f"Your role ({role}) cannot {permission} {module}."
+                        f"Your role ({role}) {denied}."
                     )
                 elif isinstance(event, CallbackQuery):
                     await event.answer(
-                        f"Access denied: {role} cannot {permission} {module}",
+                        f"Access denied: {role} {denied}",
                         show_alert=True
                     )
                 return
@@ -295,21 +387,24 @@ def require_role(*roles: str):
         async def admin_handler(message: Message):
             ...
     """
+    required_roles = frozenset(roles)
+    roles_str = ", ".join(roles)
+
     def decorator(handler: Callable) -> Callable:
         async def wrapper(event: TelegramObject, *args, **kwargs):
             rbac: Optional[RBACContext] = kwargs.get("rbac")
 
-            if not rbac or not rbac.has_role(*roles):
+            if not rbac or not rbac.has_role_set(required_roles):
                 current_role = rbac.role if rbac else "guest"
                 if isinstance(event, Message):
                     await event.answer(
                         f"Access denied.\n"
-                        f"Required roles: {', '.join(roles)}\n"
+                        f"Required roles: {roles_str}\n"
                         f"Your role: {current_role}"
                     )
                 elif isinstance(event, CallbackQuery):
                     await event.answer(
-                        f"Access denied: requires {', '.join(roles)}",
+                        f"Access denied: requires {roles_str}",
                         show_alert=True
                     )
                 return
@@ -3,6 +3,7 @@ from .session import (
     Role,
     Module,
     Permission,
+    MODULE_BITS,
     UserSession,
     OTPVerifyResponse,
     SessionRestoreResponse,
@@ -14,6 +15,7 @@ __all__ = [
     "Role",
     "Module",
     "Permission",
+    "MODULE_BITS",
     "UserSession",
     "OTPVerifyResponse",
     "SessionRestoreResponse",
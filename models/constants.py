@@ -0,0 +1,35 @@
+"""
+RBAC String Constants
+Plain-string counterparts of the Role, Module and Permission enums,
+used as keys in the RBAC lookup tables
+"""
+from typing import Final
+
+
+# Roles
+ROLE_CLIENT: Final = "client"
+ROLE_VOLUNTEER_ADMIN: Final = "volunteer_admin"
+ROLE_MSB: Final = "msb"
+ROLE_NPO: Final = "npo"
+ROLE_GOVERNMENT: Final = "government"
+ROLE_ADMINISTRATOR: Final = "administrator"
+ROLE_SUPER_ADMIN: Final = "super_admin"
+
+# Modules
+MODULE_VOLUNTEERS: Final = "volunteers"
+MODULE_VACANCIES: Final = "vacancies"
+MODULE_LEISURE: Final = "leisure"
+MODULE_PROJECTS: Final = "projects"
+MODULE_EVENTS: Final = "events"
+MODULE_NEWS: Final = "news"
+MODULE_USERS: Final = "users"
+MODULE_COURSES: Final = "courses"
+MODULE_CERTIFICATES: Final = "certificates"
+MODULE_EXPERTS: Final = "experts"
+MODULE_RESUMES: Final = "resumes"
+
+# Permissions
+PERMISSION_READ: Final = "read"
+PERMISSION_CREATE: Final = "create"
+PERMISSION_UPDATE: Final = "update"
+PERMISSION_DELETE: Final = "delete"
@@ -2,9 +2,9 @@
 Session and User Models
 Pydantic models for session management and data transfer
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+import time
 from typing import Optional
-from datetime import datetime
 from enum import Enum
 
 
@@ -33,6 +33,15 @@ class Module(str, Enum):
     EXPERTS = "experts"
     RESUMES = "resumes"
 
+    @property
+    def bit(self) -> int:
+        """Bit flag of this module in RBAC permission masks"""
+        return MODULE_BITS[self]
+
+
+# Module name -> bit flag (1 << ordinal); Module members resolve too as str enums
+MODULE_BITS = {module.value: 1 << ordinal for ordinal, module in enumerate(Module)}
+
 
 class Permission(str, Enum):
     """Permission types"""
@@ -49,12 +58,13 @@ class UserSession(BaseModel):
     role: str
     access_token: str
     admin_name: Optional[str] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    last_activity: datetime = Field(default_factory=datetime.utcnow)
+    # Unix timestamps (seconds)
+    created_at: float = Field(default_factory=time.time)
+    last_activity: float = Field(default_factory=time.time)
 
     def update_activity(self):
         """Update last activity timestamp"""
-        self.last_activity = datetime.utcnow()
+        self.last_activity = time.time()
 
 
 class OTPVerifyResponse(BaseModel):
@@ -93,11 +103,12 @@ class PaginatedResponse(BaseModel):
     page: int
     page_size: int
     total_pages: int
-
-    @property
-    def has_next(self) -> bool:
-        return self.page < self.total_pages
-
-    @property
-    def has_prev(self) -> bool:
-        return self.page > 1
+    # Derived from page/total_pages at construction
+    has_next: bool = False
+    has_prev: bool = False
+
+    @model_validator(mode="after")
+    def _compute_navigation(self) -> "PaginatedResponse":
+        self.has_next = self.page < self.total_pages
+        self.has_prev = self.page > 1
+        return self
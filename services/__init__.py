@@ -4,9 +4,12 @@ from .session import (
     get_session_service,
     close_session_service,
 )
+from .redis_pool import get_redis_pool, close_redis_pool
 
 __all__ = [
     "SessionService",
     "get_session_service",
     "close_session_service",
+    "get_redis_pool",
+    "close_redis_pool",
 ]
@@ -0,0 +1,44 @@
+"""
+Shared Redis Connection Pool
+One pool per process, handed to every service that talks to Redis
+"""
+import logging
+from typing import Optional
+
+from redis.asyncio import BlockingConnectionPool
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Global pool instance
+_redis_pool: Optional[BlockingConnectionPool] = None
+
+
+def get_redis_pool() -> BlockingConnectionPool:
+    """
+    Get or create the shared Redis connection pool
+
+    When every connection is busy, callers wait for one to be released
+    (up to redis_pool_timeout seconds) instead of failing outright.
+    """
+    global _redis_pool
+    if _redis_pool is None:
+        _redis_pool = BlockingConnectionPool.from_url(
+            settings.redis_url,
+            encoding="utf-8",
+            decode_responses=True,
+            max_connections=settings.redis_max_connections,
+            timeout=settings.redis_pool_timeout,
+            health_check_interval=settings.redis_health_check_interval,
+        )
+    return _redis_pool
+
+
+async def close_redis_pool():
+    """Disconnect every connection in the shared pool"""
+    global _redis_pool
+    if _redis_pool:
+        await _redis_pool.aclose()
+        _redis_pool = None
+        logger.info("Redis connection pool closed")
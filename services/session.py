@@ -2,42 +2,95 @@
 Redis Session Management Service
 Handles user session storage, retrieval, and invalidation
 """
-import json
 import logging
-from typing import Optional
-from datetime import datetime
+import time
+from typing import Dict, Optional, Union
 
-import redis.asyncio as redis
+from cachetools import TTLCache
+from pydantic import ValidationError
 from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+from redis.commands.core import AsyncScript
 
 from config import settings
 from models import UserSession
+from .redis_pool import close_redis_pool, get_redis_pool
 
 logger = logging.getLogger(__name__)
 
+# Grant up to ARGV[2] requests from a window of ARGV[3], count only what was
+# granted, and start the window, all in one atomic call.
+# Returns {granted, count, seconds left in the window}.
+# TTL < 0 covers new keys and keys that lost their expiry.
+RATE_LIMIT_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local granted = math.min(tonumber(ARGV[2]), math.max(0, tonumber(ARGV[3]) - current))
+local count = current
+if granted > 0 then
+    count = redis.call('INCRBY', KEYS[1], granted)
+end
+local ttl = redis.call('TTL', KEYS[1])
+if ttl < 0 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+    ttl = tonumber(ARGV[1])
+end
+return {granted, count, ttl}
+"""
+
+# Rewrite last_activity and refresh the TTL only if the session hash still
+# exists, so a touch never recreates a logged-out or expired session.
+TOUCH_SESSION_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('HSET', KEYS[1], 'last_activity', ARGV[1])
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+    return 1
+end
+return 0
+"""
+
 
 class SessionService:
     """
     Redis-based session management
 
-    Session keys: tg_session:{telegram_user_id}
+    Session keys: tg_session:{telegram_user_id} (hash of session fields)
     Rate limit keys: tg_rate:{telegram_user_id}:{action}
+
+    Decoded sessions are also kept in a short-lived in-process cache,
+    so a burst of updates from one user costs a single Redis GET.
+    Changes made by other processes show up once the entry expires.
     """
 
     SESSION_PREFIX = "tg_session:"
     RATE_LIMIT_PREFIX = "tg_rate:"
 
+    # In-process session cache bounds
+    LOCAL_CACHE_TTL = 5
+    LOCAL_CACHE_MAXSIZE = 10_000
+
+    # Minimum seconds between activity writes for one user
+    ACTIVITY_DEBOUNCE = 30
+
     def __init__(self):
         self._redis: Optional[Redis] = None
+        self._rate_script: Optional[AsyncScript] = None
+        self._touch_script: Optional[AsyncScript] = None
+        self._local: TTLCache[str, UserSession] = TTLCache(
+            maxsize=self.LOCAL_CACHE_MAXSIZE,
+            ttl=min(settings.redis_session_ttl, self.LOCAL_CACHE_TTL),
+        )
+        # Users whose activity was written within the debounce window
+        self._recently_touched: TTLCache[str, bool] = TTLCache(
+            maxsize=self.LOCAL_CACHE_MAXSIZE,
+            ttl=min(settings.redis_session_ttl / 2, self.ACTIVITY_DEBOUNCE),
+        )
 
     async def connect(self):
         """Connect to Redis"""
         if self._redis is None:
-            self._redis = redis.from_url(
-                settings.redis_url,
-                encoding="utf-8",
-                decode_responses=True,
-            )
+            self._redis = Redis(connection_pool=get_redis_pool())
+            self._rate_script = self._redis.register_script(RATE_LIMIT_SCRIPT)
+            self._touch_script = self._redis.register_script(TOUCH_SESSION_SCRIPT)
             # Test connection
             await self._redis.ping()
             logger.info("Connected to Redis")
@@ -47,6 +100,8 @@ class SessionService:
         if self._redis:
             await self._redis.aclose()
             self._redis = None
+            self._local.clear()
+            self._recently_touched.clear()
             logger.info("Redis connection closed")
 
     def _session_key(self, telegram_user_id: str) -> str:
@@ -57,6 +112,11 @@ class SessionService:
         """Generate rate limit key"""
         return f"{self.RATE_LIMIT_PREFIX}{telegram_user_id}:{action}"
 
+    def _session_to_mapping(self, session: UserSession) -> Dict[str, Union[str, int, float]]:
+        """Flatten session into hash fields (Redis cannot store None)"""
+        # All fields are scalars, so no JSON-mode conversion is needed
+        return session.model_dump(exclude_none=True)
+
     # ==================== Session Management ====================
 
     async def create_session(
@@ -80,24 +140,26 @@ class SessionService:
         Returns:
             Created UserSession
         """
+        now = time.time()
         session = UserSession(
             telegram_user_id=str(telegram_user_id),
             admin_id=admin_id,
             role=role,
             access_token=access_token,
             admin_name=admin_name,
-            created_at=datetime.utcnow(),
-            last_activity=datetime.utcnow(),
+            created_at=now,
+            last_activity=now,
         )
 
         key = self._session_key(telegram_user_id)
-        session_data = session.model_dump_json()
 
-        await self._redis.setex(
-            key,
-            settings.redis_session_ttl,
-            session_data,
-        )
+        async with self._redis.pipeline(transaction=True) as pipe:
+            # Replace any previous session instead of merging fields into it
+            await pipe.delete(key)
+            await pipe.hset(key, mapping=self._session_to_mapping(session))
+            await pipe.expire(key, settings.redis_session_ttl)
+            await pipe.execute()
+        self._local[session.telegram_user_id] = session
 
         logger.info(f"Session created for telegram_user_id={telegram_user_id}")
         return session
@@ -112,16 +174,42 @@ class SessionService:
         Returns:
             UserSession if exists, None otherwise
         """
+        session = self._local.get(telegram_user_id)
+        if session is not None:
+            return session
+
         key = self._session_key(telegram_user_id)
-        session_data = await self._redis.get(key)
+        try:
+            session_data = await self._redis.hgetall(key)
+        except ResponseError as e:
+            session_data = e
+        session = await self._load_session(key, session_data)
+        if session is not None:
+            self._local[telegram_user_id] = session
+        return session
+
+    async def _load_session(
+        self,
+        key: str,
+        session_data: Union[Dict[str, str], ResponseError, None],
+    ) -> Optional[UserSession]:
+        """
+        Validate HGETALL session fields, dropping the key if corrupted
+
+        A ResponseError means the key holds another type, e.g. a JSON
+        string session written before sessions were stored as hashes.
+        """
+        if isinstance(session_data, ResponseError):
+            logger.warning(f"Dropping non-hash session key {key}: {session_data}")
+            await self._redis.delete(key)
+            return None
 
         if not session_data:
             return None
 
         try:
-            data = json.loads(session_data)
-            return UserSession(**data)
-        except (json.JSONDecodeError, ValueError) as e:
+            return UserSession.model_validate(session_data)
+        except ValidationError as e:
             logger.error(f"Failed to parse session data: {e}")
             await self._redis.delete(key)
             return None
@@ -130,20 +218,32 @@ class SessionService:
         """
         Update existing session (refresh activity)
 
+        Only the last_activity field is rewritten and the TTL refreshed,
+        at most once per ACTIVITY_DEBOUNCE seconds per user; in between,
+        only the in-memory session is touched.
+
         Args:
             session: UserSession to update
 
         Returns:
-            True if updated successfully
+            True if updated successfully, False if the session no longer
+            exists in Redis (logged out elsewhere, expired or evicted)
         """
         session.update_activity()
+        if session.telegram_user_id in self._recently_touched:
+            return True
+
         key = self._session_key(session.telegram_user_id)
 
-        await self._redis.setex(
-            key,
-            settings.redis_session_ttl,
-            session.model_dump_json(),
+        touched = await self._touch_script(
+            keys=[key], args=[session.last_activity, settings.redis_session_ttl]
         )
+        if not touched:
+            self._local.pop(session.telegram_user_id, None)
+            return False
+
+        self._local[session.telegram_user_id] = session
+        self._recently_touched[session.telegram_user_id] = True
         return True
 
     async def delete_session(self, telegram_user_id: str) -> bool:
@@ -156,6 +256,8 @@ class SessionService:
         Returns:
             True if deleted, False if not found
         """
+        self._local.pop(str(telegram_user_id), None)
+        self._recently_touched.pop(str(telegram_user_id), None)
         key = self._session_key(telegram_user_id)
         result = await self._redis.delete(key)
         if result:
@@ -194,21 +296,73 @@ class SessionService:
             Tuple of (is_allowed, remaining_requests)
         """
         key = self._rate_key(telegram_user_id, action)
+        granted, current_count, _ = await self._rate_script(
+            keys=[key], args=[window_seconds, 1, max_requests]
+        )
+        return self._rate_result(
+            telegram_user_id, action, granted, current_count, max_requests
+        )
 
-        # Use Redis pipeline for atomic operations
-        async with self._redis.pipeline(transaction=True) as pipe:
-            await pipe.incr(key)
-            await pipe.ttl(key)
-            results = await pipe.execute()
+    async def batched_check(
+        self,
+        telegram_user_id: str,
+        action: str,
+        max_requests: int,
+        window_seconds: int = 60,
+        reserve: int = 1,
+    ) -> tuple[int, int, Optional[UserSession]]:
+        """
+        Reserve requests from the rate-limit window and fetch the user
+        session in one Redis round-trip
+
+        Only granted requests are counted against the window, and they are
+        counted up front, so callers may spend them locally without the
+        shared count ever falling behind.
+
+        Args:
+            telegram_user_id: Telegram user ID
+            action: Action identifier (e.g., "login", "api_call")
+            max_requests: Maximum allowed requests in window
+            window_seconds: Time window in seconds
+            reserve: Requests to reserve (at least 1)
+
+        Returns:
+            Tuple of (granted_requests, window_seconds_left, session or None)
+        """
+        rate_key = self._rate_key(telegram_user_id, action)
+        session_key = self._session_key(telegram_user_id)
+
+        # The counter script is atomic on its own, so no MULTI is needed
+        async with self._redis.pipeline(transaction=False) as pipe:
+            await self._rate_script(
+                keys=[rate_key],
+                args=[window_seconds, reserve, max_requests],
+                client=pipe,
+            )
+            await pipe.hgetall(session_key)
+            rate_result, session_data = await pipe.execute(raise_on_error=False)
 
-        current_count = results[0]
-        ttl = results[1]
+        if isinstance(rate_result, Exception):
+            raise rate_result
 
-        # Set expiry if first request in window
-        if ttl == -1:
-            await self._redis.expire(key, window_seconds)
+        granted, current_count, window_left = rate_result
+        self._rate_result(telegram_user_id, action, granted, current_count, max_requests)
 
-        is_allowed = current_count <= max_requests
+        session = await self._load_session(session_key, session_data)
+        if session is not None:
+            self._local[telegram_user_id] = session
+        return granted, window_left, session
+
+    def _rate_result(
+        self,
+        telegram_user_id: str,
+        action: str,
+        granted: int,
+        current_count: int,
+        max_requests: int,
+    ) -> tuple[bool, int]:
+        """Turn a script result into (is_allowed, remaining_requests)"""
+        is_allowed = granted > 0
         remaining = max(0, max_requests - current_count)
 
         if not is_allowed:
@@ -243,3 +397,4 @@ async def close_session_service():
     if _session_service:
         await _session_service.close()
         _session_service = None
+    await close_redis_pool()
@@ -1,9 +1,27 @@
 """
 Test backend connectivity and API endpoints
+
+HTTP/2 is only negotiated over TLS; probing an https backend with it
+needs the extra: pip install "httpx[http2]"
 """
 import asyncio
+import importlib.util
+
 import httpx
 
+# Use HTTP/2 when the optional h2 package is installed
+_HAS_H2 = importlib.util.find_spec("h2") is not None
+
+
+def _print_auth_result(response):
+    """Print status (and body on failure) of a telegram-auth probe"""
+    if isinstance(response, Exception):
+        print(f"     ❌ Error: {response}")
+        return
+    print(f"     Status: {response.status_code}")
+    if response.status_code != 200:
+        print(f"     Response: {response.text}")
+
 
 async def test_backend():
     """Test if backend is accessible"""
@@ -12,55 +30,54 @@ async def test_backend():
     print("🔍 Testing Tabys Backend Connectivity\n")
     print(f"Backend URL: {backend_url}\n")
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    async with httpx.AsyncClient(
+        timeout=10.0,
+        http2=_HAS_H2,
+        limits=httpx.Limits(max_keepalive_connections=10, max_connections=10),
+    ) as client:
+        # Probes are independent, so fire them concurrently
+        root, docs, verify, logout = await asyncio.gather(
+            client.get(f"{backend_url}/"),
+            client.get(f"{backend_url}/docs"),
+            client.post(
+                f"{backend_url}/api/v1/telegram-auth/verify-otp",
+                json={
+                    "otp_token": "TEST1234",
+                    "telegram_user_id": "123456789"
+                }
+            ),
+            client.post(
+                f"{backend_url}/api/v1/telegram-auth/logout",
+                json={"telegram_user_id": "123456789"}
+            ),
+            return_exceptions=True,
+        )
+
         # Test 1: Root endpoint
         print("1️⃣ Testing root endpoint (GET /)...")
-        try:
-            response = await client.get(f"{backend_url}/")
-            print(f"   ✅ Status: {response.status_code}")
-            print(f"   Response: {response.json()}\n")
-        except Exception as e:
-            print(f"   ❌ Error: {e}\n")
+        if isinstance(root, Exception):
+            print(f"   ❌ Error: {root}\n")
+        else:
+            print(f"   ✅ Status: {root.status_code}")
+            print(f"   Response: {root.text}\n")
 
         # Test 2: Docs endpoint
         print("2️⃣ Testing docs endpoint (GET /docs)...")
-        try:
-            response = await client.get(f"{backend_url}/docs")
-            print(f"   ✅ Status: {response.status_code}\n")
-        except Exception as e:
-            print(f"   ❌ Error: {e}\n")
+        if isinstance(docs, Exception):
+            print(f"   ❌ Error: {docs}\n")
+        else:
+            print(f"   ✅ Status: {docs.status_code}\n")
 
         # Test 3: Telegram auth endpoints (without auth)
         print("3️⃣ Testing telegram-auth endpoints...")
 
         # Test verify-otp
         print("   - POST /api/v1/telegram-auth/verify-otp (should fail - no auth)")
-        try:
-            response = await client.post(
-                f"{backend_url}/api/v1/telegram-auth/verify-otp",
-                json={
-                    "otp_token": "TEST1234",
-                    "telegram_user_id": "123456789"
-                }
-            )
-            print(f"     Status: {response.status_code}")
-            if response.status_code != 200:
-                print(f"     Response: {response.text}")
-        except Exception as e:
-            print(f"     ❌ Error: {e}")
+        _print_auth_result(verify)
 
         # Test logout
         print("   - POST /api/v1/telegram-auth/logout (should fail - no session)")
-        try:
-            response = await client.post(
-                f"{backend_url}/api/v1/telegram-auth/logout",
-                json={"telegram_user_id": "123456789"}
-            )
-            print(f"     Status: {response.status_code}")
-            if response.status_code != 200:
-                print(f"     Response: {response.text}")
-        except Exception as e:
-            print(f"     ❌ Error: {e}")
+        _print_auth_result(logout)
 
         print("\n" + "="*50)
         print("✅ Backend connectivity test complete!")
@@ -0,0 +1,79 @@
+"""
+Regression check for the general rate limiter against the configured Redis
+
+A concurrent burst of messages at or below GENERAL_RATE_LIMIT (as sent
+for a media album) must be fully admitted, and a burst above it must be
+capped at exactly the limit.
+"""
+import asyncio
+import sys
+from datetime import datetime
+
+from aiogram.types import Chat, Message, User
+
+from config import settings
+from middlewares import RateLimitMiddleware
+from services import close_session_service, get_session_service
+
+# Throwaway Telegram user IDs, well outside the real ID range
+TEST_USER_IDS = (9_000_000_001, 9_000_000_002)
+
+
+async def _send_burst(user_id: int, count: int) -> int:
+    """Send count concurrent messages from one user, return how many were admitted"""
+    middleware = RateLimitMiddleware()
+    user = User(id=user_id, is_bot=False, first_name="rate-limit-check")
+    messages = [
+        Message(
+            message_id=i,
+            date=datetime.now(),
+            chat=Chat(id=user_id, type="private"),
+            from_user=user,
+            text="ping",
+        )
+        for i in range(count)
+    ]
+
+    async def handler(event, data):
+        return True
+
+    async def send(message):
+        try:
+            return await middleware(handler, message, {})
+        except RuntimeError:
+            # Denied: the "Too many requests" reply needs a running bot
+            return False
+
+    results = await asyncio.gather(*(send(message) for message in messages))
+    return sum(result is True for result in results)
+
+
+async def test_rate_limit():
+    """Check concurrent bursts against the general rate limit"""
+    limit = settings.general_rate_limit
+    session_service = await get_session_service()
+
+    print("🔍 Testing general rate limit\n")
+    print(f"Redis URL: {settings.redis_url}")
+    print(f"Limit: {limit} requests per 60s\n")
+
+    ok = True
+    try:
+        for user_id, burst in zip(TEST_USER_IDS, (limit, limit + 10)):
+            await session_service.reset_rate_limit(str(user_id), "general")
+            admitted = await _send_burst(user_id, burst)
+            expected = min(burst, limit)
+            passed = admitted == expected
+            ok = ok and passed
+            mark = "✅" if passed else "❌"
+            print(f"{mark} Burst of {burst}: admitted {admitted}, expected {expected}")
+    finally:
+        for user_id in TEST_USER_IDS:
+            await session_service.reset_rate_limit(str(user_id), "general")
+        await close_session_service()
+
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(test_rate_limit()) else 1)
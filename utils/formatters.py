@@ -2,97 +2,216 @@
 Text Formatters and Helpers
 Utilities for formatting bot messages
 """
-from typing import Dict, Any, Optional, List
-from datetime import datetime
-import html
+from typing import Callable, Dict, Any, Optional, List, Tuple, Union
+from datetime import datetime, timezone
+import re
+import sys
+from functools import lru_cache
+
+# Shared placeholder values, so defaults and escape-cache keys are one object
+_NA = sys.intern("N/A")
+_UNTITLED = sys.intern("Untitled")
+_FREE = sys.intern("Free")
+_KZT = sys.intern("KZT")
+
+# Same replacements as html.escape(quote=True), applied in one pass
+_HTML_ESCAPE_TABLE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#x27;",
+})
+_HTML_SPECIAL_RE = re.compile(r"[&<>\"']")
+# Bound once so the per-call path skips the pattern attribute lookup
+_find_html_special = _HTML_SPECIAL_RE.search
+
+# Strings shorter than this (labels, names, currencies) go through the cache
+_ESCAPE_CACHE_MAX_LEN = 128
+
+# Message templates, filled with already-escaped values
+_EVENT_TEMPLATE = (
+    "<b>{title}</b>\n\n"
+    "<b>Date:</b> {date}\n"
+    "<b>Location:</b> {location}\n"
+    "<b>Format:</b> {format_type}\n\n"
+    "<b>Description:</b>\n{description}"
+)
+_COURSE_TEMPLATE = (
+    "<b>{title}</b>\n\n"
+    "<b>Language:</b> {language}\n"
+    "<b>Duration:</b> {duration}\n"
+    "<b>Level:</b> {level}\n"
+    "<b>Price:</b> {price}\n\n"
+    "<b>Description:</b>\n{description}"
+)
+_VACANCY_TEMPLATE = (
+    "<b>{title}</b>\n\n"
+    "<b>Company:</b> {company}\n"
+    "<b>Employment:</b> {employment_type}\n"
+    "<b>Work Type:</b> {work_type}\n"
+    "<b>Salary:</b> {salary}\n\n"
+    "<b>Description:</b>\n{description}"
+)
+_NEWS_TEMPLATE = (
+    "<b>{title}</b>\n\n"
+    "<b>Date:</b> {date}\n"
+    "<b>Category:</b> {category}\n"
+    "<b>Source:</b> {source}\n\n"
+    "{content}"
+)
+_PROJECT_TEMPLATE = (
+    "<b>{title}</b>\n\n"
+    "<b>Status:</b> {status}\n\n"
+    "<b>Description:</b>\n{description}"
+)
+
+
+def _escape(text: str) -> str:
+    """Escape a str, returning it as-is when there is nothing to escape"""
+    if _find_html_special(text) is None:
+        return text
+    return text.translate(_HTML_ESCAPE_TABLE)
+
+
+_escape_cached = lru_cache(maxsize=2048)(_escape)
 
 
 def escape_html(text: str) -> str:
     """Escape HTML special characters"""
     if text is None:
         return ""
-    return html.escape(str(text))
+    if type(text) is not str:
+        text = str(text)
+    if len(text) < _ESCAPE_CACHE_MAX_LEN:
+        return _escape_cached(text)
+    return _escape(text)
 
 
-def format_datetime(dt: datetime, include_time: bool = True) -> str:
-    """Format datetime for display"""
-    if dt is None:
-        return "N/A"
+# Localized field keys, in order of preference
+_VACANCY_TITLE_KEYS = ("title_ru", "title_kz")
+_VACANCY_DESCRIPTION_KEYS = ("description_ru", "description_kz")
+_TITLE_KEYS = ("title_ru", "title_kz", "title")
+_CONTENT_KEYS = ("content_ru", "content_kz", "content")
+_DESCRIPTION_KEYS = ("description_ru", "description_kz", "description")
+
+
+def _first_present(item: Dict[str, Any], keys: Tuple[str, ...], default: Any) -> Any:
+    """Return the first truthy value among keys, or default"""
+    for key in keys:
+        value = item.get(key)
+        if value:
+            return value
+    return default
+
+
+def _truncate(text: str, limit: int = 500) -> str:
+    """Cut text to at most limit characters, ending in "..." if cut"""
+    return text if len(text) <= limit else text[:limit - 3] + "..."
 
-    if isinstance(dt, str):
-        try:
-            dt = datetime.fromisoformat(dt.replace("Z", "+00:00"))
-        except ValueError:
-            return dt
 
+@lru_cache(maxsize=512)
+def _format_price(price: Union[int, float], currency: str) -> str:
+    """Format a price with thousands separators, or "Free" when zero"""
+    return f"{price:,.0f} {currency}" if price else _FREE
+
+
+@lru_cache(maxsize=1024)
+def _parse_iso(value: str) -> Optional[datetime]:
+    """Parse an ISO 8601 string (with optional "Z" suffix), None if invalid"""
+    try:
+        # Python 3.11+ accepts the "Z" suffix directly
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _format_wall_time(dt: datetime, include_time: bool) -> str:
+    """strftime a naive (wall-clock) datetime"""
     if include_time:
         return dt.strftime("%d.%m.%Y %H:%M")
     return dt.strftime("%d.%m.%Y")
 
 
+def format_datetime(dt: Union[datetime, str, float], include_time: bool = True) -> str:
+    """Format datetime (or ISO string / UTC unix timestamp) for display"""
+    if dt is None:
+        return _NA
+
+    # Datetimes parsed upstream skip both conversion checks
+    if type(dt) is not datetime:
+        if isinstance(dt, str):
+            parsed = _parse_iso(dt)
+            if parsed is None:
+                return dt
+            dt = parsed
+        elif isinstance(dt, (int, float)):
+            dt = datetime.fromtimestamp(dt, tz=timezone.utc)
+
+    # Aware datetimes hash by instant, so the cache is keyed on wall-clock
+    # time to keep e.g. 12:00+00:00 and 17:00+05:00 apart; plain dates have
+    # no tzinfo and pass through unchanged
+    if getattr(dt, "tzinfo", None) is not None:
+        dt = dt.replace(tzinfo=None)
+    return _format_wall_time(dt, include_time)
+
+
 def format_event(event: Dict[str, Any]) -> str:
     """Format event data for display"""
-    title = escape_html(event.get("title", "Untitled"))
-    location = escape_html(event.get("location", "N/A"))
-    format_type = escape_html(event.get("format", "N/A"))
-    description = escape_html(event.get("description", ""))
+    title = escape_html(event.get("title", _UNTITLED))
+    location = escape_html(event.get("location", _NA))
+    format_type = escape_html(event.get("format", _NA))
+    description = escape_html(_truncate(event.get("description") or ""))
 
     event_date = event.get("event_date") or event.get("date")
-    date_str = format_datetime(event_date) if event_date else "N/A"
-
-    # Truncate long descriptions
-    if len(description) > 500:
-        description = description[:497] + "..."
-
-    return (
-        f"<b>{title}</b>\n\n"
-        f"<b>Date:</b> {date_str}\n"
-        f"<b>Location:</b> {location}\n"
-        f"<b>Format:</b> {format_type}\n\n"
-        f"<b>Description:</b>\n{description}"
+    date_str = format_datetime(event_date) if event_date else _NA
+
+    return _EVENT_TEMPLATE.format(
+        title=title,
+        date=date_str,
+        location=location,
+        format_type=format_type,
+        description=description,
     )
 
 
 def format_course(course: Dict[str, Any]) -> str:
     """Format course data for display"""
-    title = escape_html(course.get("title", "Untitled"))
-    description = escape_html(course.get("description", ""))
-    language = escape_html(course.get("language", "N/A"))
+    title = escape_html(course.get("title", _UNTITLED))
+    description = escape_html(_truncate(course.get("description") or ""))
+    language = escape_html(course.get("language", _NA))
     duration = course.get("duration", 0)
     price = course.get("price", 0)
-    currency = escape_html(course.get("currency", "KZT"))
-    level = escape_html(course.get("level", "N/A"))
+    currency = escape_html(course.get("currency", _KZT))
+    level = escape_html(course.get("level", _NA))
 
     # Format duration
     hours = duration // 60
     minutes = duration % 60
     duration_str = f"{hours}h {minutes}m" if hours else f"{minutes}m"
 
-    # Truncate long descriptions
-    if len(description) > 500:
-        description = description[:497] + "..."
+    price_str = _format_price(price, currency)
 
-    price_str = f"{price:,.0f} {currency}" if price else "Free"
-
-    return (
-        f"<b>{title}</b>\n\n"
-        f"<b>Language:</b> {language}\n"
-        f"<b>Duration:</b> {duration_str}\n"
-        f"<b>Level:</b> {level}\n"
-        f"<b>Price:</b> {price_str}\n\n"
-        f"<b>Description:</b>\n{description}"
+    return _COURSE_TEMPLATE.format(
+        title=title,
+        language=language,
+        duration=duration_str,
+        level=level,
+        price=price_str,
+        description=description,
     )
 
 
 def format_vacancy(vacancy: Dict[str, Any]) -> str:
     """Format vacancy data for display"""
-    title = vacancy.get("title_ru") or vacancy.get("title_kz") or "Untitled"
+    title = _first_present(vacancy, _VACANCY_TITLE_KEYS, _UNTITLED)
     title = escape_html(title)
-    description = vacancy.get("description_ru") or vacancy.get("description_kz") or ""
-    description = escape_html(description)
-    company = escape_html(vacancy.get("company_name", "N/A"))
-    employment_type = escape_html(vacancy.get("employment_type", "N/A"))
-    work_type = escape_html(vacancy.get("work_type", "N/A"))
+    description = _first_present(vacancy, _VACANCY_DESCRIPTION_KEYS, "")
+    description = escape_html(_truncate(description))
+    company = escape_html(vacancy.get("company_name", _NA))
+    employment_type = escape_html(vacancy.get("employment_type", _NA))
+    work_type = escape_html(vacancy.get("work_type", _NA))
 
     salary_min = vacancy.get("salary_min")
     salary_max = vacancy.get("salary_max")
@@ -105,96 +224,101 @@ def format_vacancy(vacancy: Dict[str, Any]) -> str:
     else:
         salary_str = "Negotiable"
 
-    # Truncate long descriptions
-    if len(description) > 500:
-        description = description[:497] + "..."
-
-    return (
-        f"<b>{title}</b>\n\n"
-        f"<b>Company:</b> {company}\n"
-        f"<b>Employment:</b> {employment_type}\n"
-        f"<b>Work Type:</b> {work_type}\n"
-        f"<b>Salary:</b> {salary_str}\n\n"
-        f"<b>Description:</b>\n{description}"
+    return _VACANCY_TEMPLATE.format(
+        title=title,
+        company=company,
+        employment_type=employment_type,
+        work_type=work_type,
+        salary=salary_str,
+        description=description,
     )
 
 
 def format_news(news: Dict[str, Any]) -> str:
     """Format news article for display"""
-    title = news.get("title_ru") or news.get("title_kz") or news.get("title") or "Untitled"
+    title = _first_present(news, _TITLE_KEYS, _UNTITLED)
     title = escape_html(title)
-    content = news.get("content_ru") or news.get("content_kz") or news.get("content") or ""
-    content = escape_html(content)
-    category = escape_html(news.get("category", "N/A"))
-    source = escape_html(news.get("source", "N/A"))
+    content = _first_present(news, _CONTENT_KEYS, "")
+    content = escape_html(_truncate(content))
+    category = escape_html(news.get("category", _NA))
+    source = escape_html(news.get("source", _NA))
 
     published_at = news.get("published_at") or news.get("created_at")
-    date_str = format_datetime(published_at) if published_at else "N/A"
-
-    # Truncate long content
-    if len(content) > 500:
-        content = content[:497] + "..."
-
-    return (
-        f"<b>{title}</b>\n\n"
-        f"<b>Date:</b> {date_str}\n"
-        f"<b>Category:</b> {category}\n"
-        f"<b>Source:</b> {source}\n\n"
-        f"{content}"
+    date_str = format_datetime(published_at) if published_at else _NA
+
+    return _NEWS_TEMPLATE.format(
+        title=title,
+        date=date_str,
+        category=category,
+        source=source,
+        content=content,
     )
 
 
 def format_project(project: Dict[str, Any]) -> str:
     """Format project data for display"""
-    title = project.get("title_ru") or project.get("title_kz") or project.get("title") or "Untitled"
+    title = _first_present(project, _TITLE_KEYS, _UNTITLED)
     title = escape_html(title)
-    description = project.get("description_ru") or project.get("description_kz") or project.get("description") or ""
-    description = escape_html(description)
-    status = escape_html(project.get("status", "N/A"))
+    description = _first_present(project, _DESCRIPTION_KEYS, "")
+    description = escape_html(_truncate(description))
+    status = escape_html(project.get("status", _NA))
+
+    return _PROJECT_TEMPLATE.format(
+        title=title,
+        status=status,
+        description=description,
+    )
 
-    # Truncate long descriptions
-    if len(description) > 500:
-        description = description[:497] + "..."
 
-    return (
-        f"<b>{title}</b>\n\n"
-        f"<b>Status:</b> {status}\n\n"
-        f"<b>Description:</b>\n{description}"
-    )
+def _format_event_item(item: Dict[str, Any], index: int) -> str:
+    """Format an events list row"""
+    title = escape_html(item.get("title", _UNTITLED))
+    date = format_datetime(item.get("event_date") or item.get("date"), include_time=False)
+    return f"{index}. <b>{title}</b> - {date}"
+
+
+def _format_course_item(item: Dict[str, Any], index: int) -> str:
+    """Format a courses list row"""
+    title = escape_html(item.get("title", _UNTITLED))
+    price = item.get("price", 0)
+    price_str = _format_price(price, _KZT)
+    return f"{index}. <b>{title}</b> - {price_str}"
+
+
+def _format_vacancy_item(item: Dict[str, Any], index: int) -> str:
+    """Format a vacancies list row"""
+    title = _first_present(item, _VACANCY_TITLE_KEYS, _UNTITLED)
+    title = escape_html(title)
+    company = escape_html(item.get("company_name", ""))
+    return f"{index}. <b>{title}</b> - {company}"
+
+
+def _format_localized_item(item: Dict[str, Any], index: int) -> str:
+    """Format a news/projects list row"""
+    title = _first_present(item, _TITLE_KEYS, _UNTITLED)
+    title = escape_html(title)
+    return f"{index}. <b>{title}</b>"
+
+
+def _format_default_item(item: Dict[str, Any], index: int) -> str:
+    """Format a list row for any other module"""
+    title = escape_html(item.get("title", item.get("name", f"Item {item.get('id')}")))
+    return f"{index}. <b>{title}</b>"
+
+
+# Module -> list row formatter
+_LIST_ITEM_FORMATTERS: Dict[str, Callable[[Dict[str, Any], int], str]] = {
+    "events": _format_event_item,
+    "courses": _format_course_item,
+    "vacancies": _format_vacancy_item,
+    "news": _format_localized_item,
+    "projects": _format_localized_item,
+}
 
 
 def format_list_item(item: Dict[str, Any], index: int, module: str) -> str:
     """Format a single list item"""
-    if module == "events":
-        title = escape_html(item.get("title", "Untitled"))
-        date = format_datetime(item.get("event_date") or item.get("date"), include_time=False)
-        return f"{index}. <b>{title}</b> - {date}"
-
-    elif module == "courses":
-        title = escape_html(item.get("title", "Untitled"))
-        price = item.get("price", 0)
-        price_str = f"{price:,.0f} KZT" if price else "Free"
-        return f"{index}. <b>{title}</b> - {price_str}"
-
-    elif module == "vacancies":
-        title = item.get("title_ru") or item.get("title_kz") or "Untitled"
-        title = escape_html(title)
-        company = escape_html(item.get("company_name", ""))
-        return f"{index}. <b>{title}</b> - {company}"
-
-    elif module == "news":
-        title = item.get("title_ru") or item.get("title_kz") or item.get("title") or "Untitled"
-        title = escape_html(title)
-        return f"{index}. <b>{title}</b>"
-
-    elif module == "projects":
-        title = item.get("title_ru") or item.get("title_kz") or item.get("title") or "Untitled"
-        title = escape_html(title)
-        return f"{index}. <b>{title}</b>"
-
-    else:
-        title = escape_html(item.get("title", item.get("name", f"Item {item.get('id')}")))
-        return f"{index}. <b>{title}</b>"
+    return _LIST_ITEM_FORMATTERS.get(module, _format_default_item)(item, index)
 
 
 def format_list(items: List[Dict[str, Any]], module: str, page: int = 1, page_size: int = 10) -> str:
@@ -202,11 +326,13 @@ def format_list(items: List[Dict[str, Any]], module: str, page: int = 1, page_si
     if not items:
         return f"No {module} found."
 
-    lines = []
-    for i, item in enumerate(items, start=(page - 1) * page_size + 1):
-        lines.append(format_list_item(item, i, module))
-
-    return "\n".join(lines)
+    # Resolve the row formatter once per page, not once per row
+    format_item = _LIST_ITEM_FORMATTERS.get(module, _format_default_item)
+    start = (page - 1) * page_size + 1
+    return "\n".join([
+        format_item(item, i)
+        for i, item in enumerate(items, start=start)
+    ])
 
 
 def format_error(error_message: str) -> str:
@@ -2,12 +2,75 @@
 Logging Configuration
 Structured logging setup for the bot
 """
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 from typing import Optional
 
+import orjson
+
 from config import settings
 
+# Background thread writing queued records to stdout
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _stop_queue_listener():
+    """Stop the current listener, flushing records still queued"""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+# One hook for whichever listener is current at exit
+atexit.register(_stop_queue_listener)
+
+
+class PrebuiltFormatter(logging.Formatter):
+    """
+    Formatter that checks its template for %(asctime) once, at construction
+
+    logging.Formatter re-scans the template on every record to decide
+    whether to render the timestamp.
+    """
+
+    def __init__(self, fmt: Optional[str] = None):
+        super().__init__(fmt)
+        self._uses_time = self._style.usesTime()
+
+    def usesTime(self) -> bool:
+        return self._uses_time
+
+
+class JsonBytesHandler(logging.Handler):
+    """
+    Write each record as one orjson-encoded line to stdout's byte buffer
+
+    Skips the %-format template and the text-layer encode of StreamHandler.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._stream = sys.stdout.buffer
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self._stream.write(orjson.dumps(
+                {
+                    "time": record.created,
+                    "level": record.levelname,
+                    "logger": record.name,
+                    "message": record.getMessage(),
+                },
+                option=orjson.OPT_APPEND_NEWLINE,
+            ))
+            self._stream.flush()
+        except Exception:
+            self.handleError(record)
+
 
 def setup_logging(level: Optional[str] = None) -> None:
     """
@@ -16,17 +79,36 @@ def setup_logging(level: Optional[str] = None) -> None:
     Args:
         level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
     """
+    global _queue_listener
+
     log_level = level or settings.log_level
     log_format = settings.log_format
 
-    # Root logger configuration
-    logging.basicConfig(
-        level=getattr(logging, log_level.upper()),
-        format=log_format,
-        handlers=[
-            logging.StreamHandler(sys.stdout)
-        ]
+    # Records are only queued on the event loop thread; a listener
+    # thread formats and writes them, so stdout I/O never blocks handlers
+    if settings.log_json:
+        stream_handler = JsonBytesHandler()
+    else:
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(PrebuiltFormatter(log_format))
+
+    _stop_queue_listener()
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, stream_handler, respect_handler_level=True
     )
+    _queue_listener.start()
+
+    # Root logger configuration
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    # The queue handler merges args (and any traceback) into the message
+    # before enqueueing; a prebuilt formatter keeps that step minimal
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(PrebuiltFormatter())
+    root.addHandler(queue_handler)
+    root.setLevel(getattr(logging, log_level.upper()))
 
     # Set levels for noisy libraries
     logging.getLogger("httpx").setLevel(logging.WARNING)
@@ -34,7 +116,7 @@ def setup_logging(level: Optional[str] = None) -> None:
     logging.getLogger("aiogram").setLevel(logging.INFO)
 
     logger = logging.getLogger(__name__)
-    logger.info(f"Logging configured with level: {log_level}")
+    logger.info("Logging configured with level: %s", log_level)
 
 
 class BotLogger:
@@ -54,10 +136,11 @@ class BotLogger:
         extra: Optional[dict] = None,
     ):
         """Log user action"""
-        msg = f"[USER:{user_id}] {action}"
         if extra:
-            msg += f" | {extra}"
-        self.logger.info(msg)
+            # extra is only stringified if the record is emitted
+            self.logger.info("[USER:%s] %s | %s", user_id, action, extra)
+        else:
+            self.logger.info("[USER:%s] %s", user_id, action)
 
     def api_call(
         self,
@@ -68,11 +151,11 @@ class BotLogger:
     ):
         """Log API call"""
         if error:
-            self.logger.error(f"[API] {method} {endpoint} | ERROR: {error}")
+            self.logger.error("[API] %s %s | ERROR: %s", method, endpoint, error)
         elif status_code:
-            self.logger.info(f"[API] {method} {endpoint} | {status_code}")
+            self.logger.info("[API] %s %s | %s", method, endpoint, status_code)
         else:
-            self.logger.debug(f"[API] {method} {endpoint}")
+            self.logger.debug("[API] %s %s", method, endpoint)
 
     def auth_event(
         self,
@@ -82,15 +165,17 @@ class BotLogger:
         detail: Optional[str] = None,
     ):
         """Log authentication event"""
-        status = "SUCCESS" if success else "FAILED"
-        msg = f"[AUTH:{status}] {event} | user_id={user_id}"
-        if detail:
-            msg += f" | {detail}"
-
         if success:
-            self.logger.info(msg)
+            level, status = logging.INFO, "SUCCESS"
+        else:
+            level, status = logging.WARNING, "FAILED"
+
+        if detail:
+            self.logger.log(
+                level, "[AUTH:%s] %s | user_id=%s | %s", status, event, user_id, detail
+            )
         else:
-            self.logger.warning(msg)
+            self.logger.log(level, "[AUTH:%s] %s | user_id=%s", status, event, user_id)
 
     def permission_denied(
         self,
@@ -101,8 +186,8 @@ class BotLogger:
     ):
         """Log permission denied event"""
         self.logger.warning(
-            f"[RBAC:DENIED] user_id={user_id} role={role} "
-            f"| cannot {permission} {module}"
+            "[RBAC:DENIED] user_id=%s role=%s | cannot %s %s",
+            user_id, role, permission, module,
         )
 
     def error(self, msg: str, exc_info: bool = False):